@@ -18,22 +18,32 @@ Usage:
     python deploy-skills.py --package-claude-all --package-out-dir .
 """
 
+import contextlib
+import functools
+import io
+import mmap
 import os
 import sys
 import shutil
 import argparse
+import threading
 from pathlib import Path
 import re
-import platform
-import subprocess
-import tempfile
-import zipfile
 import time
 import stat
 
 # Skills source (set in main)
 SKILLS_SOURCE = Path("skills")
 
+# Process-wide locations, resolved once (each lookup costs getpwuid/realpath syscalls)
+HOME_DIR = Path.home()
+SCRIPT_DIR = Path(__file__).resolve().parent
+CWD = Path.cwd().resolve()  # re-resolve if a --chdir style option is ever added
+
+# 1 MiB I/O buffers: fewer read/write syscalls when copying binaries and skill trees.
+COPY_BUFSIZE = 1024 * 1024
+shutil.COPY_BUFSIZE = COPY_BUFSIZE
+
 # Colors for terminal output
 class Colors:
     GREEN = '\033[0;32m'
@@ -42,22 +52,62 @@ class Colors:
     RED = '\033[0;31m'
     NC = '\033[0m'  # No Color
 
+class BufferedLog:
+    """Console lines collected during one phase, written with a single stdout write."""
+    def __init__(self):
+        self.lines = []
+
+    def info(self, msg=""):
+        self.lines.append(f"{msg}\n")
+
+    def flush(self):
+        if self.lines:
+            sys.stdout.write("".join(self.lines))
+            sys.stdout.flush()
+            self.lines.clear()
+
+# Per-thread BufferedLog of the running phase (see buffered_output / run_captured)
+_output = threading.local()
+
+# Deploy steps append to the same rule files; serialize those appends
+_RULES_LOCK = threading.Lock()
+
+def emit(msg=""):
+    log = getattr(_output, "log", None)
+    if log is None:
+        print(msg)
+    else:
+        log.info(msg)
+
+@contextlib.contextmanager
+def buffered_output():
+    """Buffer emit() output for one phase and flush it at the end; nested phases share the outer log."""
+    if getattr(_output, "log", None) is not None:
+        yield _output.log
+        return
+    log = _output.log = BufferedLog()
+    try:
+        yield log
+    finally:
+        _output.log = None
+        log.flush()
+
 def print_success(msg):
-    print(f"{Colors.GREEN}[OK] {msg}{Colors.NC}")
+    emit(f"{Colors.GREEN}[OK] {msg}{Colors.NC}")
 
 def print_info(msg):
-    print(f"{Colors.CYAN}[INFO] {msg}{Colors.NC}")
+    emit(f"{Colors.CYAN}[INFO] {msg}{Colors.NC}")
 
 def print_warning(msg):
-    print(f"{Colors.YELLOW}[WARN] {msg}{Colors.NC}")
+    emit(f"{Colors.YELLOW}[WARN] {msg}{Colors.NC}")
 
 def print_error(msg):
-    print(f"{Colors.RED}[ERR] {msg}{Colors.NC}")
+    emit(f"{Colors.RED}[ERR] {msg}{Colors.NC}")
 
 def print_header(title):
-    print(f"\n{Colors.CYAN}{'=' * 40}{Colors.NC}")
-    print(f"{Colors.CYAN}{title}{Colors.NC}")
-    print(f"{Colors.CYAN}{'=' * 40}{Colors.NC}\n")
+    emit(f"\n{Colors.CYAN}{'=' * 40}{Colors.NC}")
+    emit(f"{Colors.CYAN}{title}{Colors.NC}")
+    emit(f"{Colors.CYAN}{'=' * 40}{Colors.NC}\n")
 
 def rmtree_force(path: Path):
     def _onerror(func, p, _exc_info):
@@ -76,14 +126,114 @@ def rmtree_force(path: Path):
                 raise
             time.sleep(0.5)
 
+def fastcopy(src, dst):
+    """Copy a file like shutil.copy2, letting the kernel move the data when it can."""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        copied = False
+        copy_file_range = getattr(os, "copy_file_range", None)  # Linux; may reflink on XFS/Btrfs
+        if copy_file_range is not None:
+            try:
+                size = remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    n = copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if n == 0:
+                        # Some filesystems report 0 instead of copying anything; only
+                        # trust 0 as EOF once data has actually moved.
+                        if remaining == size:
+                            raise OSError("copy_file_range copied no data")
+                        break
+                    remaining -= n
+                copied = True
+            except OSError:
+                # e.g. EXDEV on older kernels or unsupported filesystems; restart with a plain copy.
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        if not copied:
+            shutil.copyfileobj(fsrc, fdst, COPY_BUFSIZE)
+
+    shutil.copystat(src, dst)
+    return dst
+
+def needs_copy(src_stat, dst) -> bool:
+    """False when dst already matches the source size and mtime (fastcopy preserves mtime)."""
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return True
+    return src_stat.st_size != dst_stat.st_size or src_stat.st_mtime_ns != dst_stat.st_mtime_ns
+
+def copy_file_to_all(src, dsts, src_stat=None):
+    """Copy src to every destination that is out of date, reading src once for all of them."""
+    if src_stat is None:
+        src_stat = os.stat(src)
+    stale = [dst for dst in dsts if needs_copy(src_stat, dst)]
+    if len(stale) == 1:
+        fastcopy(src, stale[0])
+    elif stale:
+        with open(src, "rb") as fsrc, contextlib.ExitStack() as stack:
+            outs = [stack.enter_context(open(dst, "wb")) for dst in stale]
+            while chunk := fsrc.read(COPY_BUFSIZE):
+                for out in outs:
+                    out.write(chunk)
+        for dst in stale:
+            shutil.copystat(src, dst)
+
+def walk_tree(top):
+    """Yield (root, dirs, files, dirfd) like os.fwalk; dirfd is None where fwalk is unavailable (Windows).
+
+    With a dirfd, entries are looked up relative to the open directory instead of re-walking the full path.
+    """
+    if hasattr(os, "fwalk"):
+        yield from os.fwalk(top, follow_symlinks=True)
+    else:
+        for root, dirs, files in os.walk(top, followlinks=True):
+            yield root, dirs, files, None
+
+def entry_path(root, name, dirfd):
+    """Path of a walk_tree entry, to be used together with dir_fd=dirfd."""
+    return name if dirfd is not None else os.path.join(root, name)
+
+@functools.lru_cache(maxsize=None)
+def snapshot_tree(src: str):
+    """Walk src once per run: ((rel_dir, subdirs, ((name, stat), ...)), ...) shared by every deploy target."""
+    snapshot = []
+    for root, dirs, files, dirfd in walk_tree(src):
+        rel = os.path.relpath(root, src)
+        stats = tuple((name, os.stat(entry_path(root, name, dirfd), dir_fd=dirfd)) for name in files)
+        snapshot.append((rel, tuple(dirs), stats))
+    return tuple(snapshot)
+
+def fast_mirror(src, dsts):
+    """Mirror the src tree into every dst (like copytree with dirs_exist_ok=True), reading each file once."""
+    src = os.fspath(src)
+    for rel, dirs, files in snapshot_tree(src):
+        root = os.path.join(src, rel)
+        targets = [os.path.normpath(os.path.join(dst, rel)) for dst in dsts]
+        if rel == os.curdir:
+            for target in targets:
+                os.makedirs(target, exist_ok=True)
+        # os.walk is top-down, so each parent already exists: one mkdir per subdirectory.
+        for name in dirs:
+            for target in targets:
+                try:
+                    os.mkdir(os.path.join(target, name))
+                except FileExistsError:
+                    pass
+        for name, src_stat in files:
+            copy_file_to_all(os.path.join(root, name), [os.path.join(target, name) for target in targets], src_stat)
+
+@functools.lru_cache(maxsize=1)
 def resolve_skills_source() -> Path:
     """Resolve skills source directory (script dir -> tools/dbcli -> cwd)."""
-    script_dir = Path(__file__).resolve().parent
-    script_skills = script_dir / "skills"
+    script_skills = SCRIPT_DIR / "skills"
     if (script_skills / "INTEGRATION.md").exists() and (script_skills / "dbcli-query" / "SKILL.md").exists():
         return script_skills
 
-    tools_skills = Path.home() / "tools" / "dbcli" / "skills"
+    tools_skills = HOME_DIR / "tools" / "dbcli" / "skills"
     if (tools_skills / "INTEGRATION.md").exists() and (tools_skills / "dbcli-query" / "SKILL.md").exists():
         return tools_skills
 
@@ -93,32 +243,49 @@ def resolve_skills_source() -> Path:
 
     return Path()
 
+RULES_START_MARKER = "<!-- DBCLI_RULES_START -->"
+RULES_END_MARKER = "<!-- DBCLI_RULES_END -->"
+
+@functools.lru_cache(maxsize=None)
+def read_integration_text(skills_source: Path) -> str:
+    """Read INTEGRATION.md once per run (empty string if missing)."""
+    integration_path = skills_source / "INTEGRATION.md"
+    if not integration_path.exists():
+        return ""
+    return integration_path.read_text(encoding="utf-8", errors="ignore")
+
 def get_dbcli_rules_block() -> str:
     """Extract DbCli rules block from INTEGRATION.md."""
-    integration_path = SKILLS_SOURCE / "INTEGRATION.md"
-    if not integration_path.exists():
+    content = read_integration_text(SKILLS_SOURCE)
+    start = content.find(RULES_START_MARKER)
+    if start == -1:
         return ""
-    content = integration_path.read_text(encoding="utf-8", errors="ignore")
-    match = re.search(r'<!-- DBCLI_RULES_START -->\s*([\s\S]*?)\s*<!-- DBCLI_RULES_END -->', content)
-    if not match:
+    start += len(RULES_START_MARKER)
+    end = content.find(RULES_END_MARKER, start)
+    if end == -1:
         return ""
-    return match.group(1).strip()
+    return content[start:end].strip()
+
+def encode_rules_block(block: str) -> bytes:
+    # Rule files are appended in binary; keep the platform newline a text-mode write would have produced.
+    return block.replace("\n", os.linesep).encode("utf-8")
 
-def append_dbcli_rules_to_file(path: Path, rules_text: str):
-    if not rules_text:
+def file_contains(path: Path, needle: bytes) -> bool:
+    """Search a file's bytes via mmap (page cache) without reading it into a Python object."""
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(needle) != -1
+        except ValueError:
+            # Empty file: nothing to map
+            return False
+
+def append_dbcli_rules_to_file(path: Path, md_block: bytes, yaml_block: bytes):
+    if path.exists() and file_contains(path, b"DBCLI_RULES_START"):
         return
-    marker = "DBCLI_RULES_START"
-    if path.exists():
-        existing = path.read_text(encoding="utf-8", errors="ignore")
-        if marker in existing:
-            return
     path.parent.mkdir(parents=True, exist_ok=True)
-    if path.suffix.lower() in {".yml", ".yaml"}:
-        commented = "\n".join([f"# {line}" for line in rules_text.splitlines()])
-        block = f"\n\n# DBCLI_RULES_START\n{commented}\n# DBCLI_RULES_END\n"
-    else:
-        block = f"\n\n<!-- DBCLI_RULES_START -->\n{rules_text}\n<!-- DBCLI_RULES_END -->\n"
-    with open(path, "a", encoding="utf-8") as f:
+    block = yaml_block if path.suffix.lower() in {".yml", ".yaml"} else md_block
+    with open(path, "ab") as f:
         f.write(block)
 
 def append_dbcli_rules(include_copilot: bool = False):
@@ -127,6 +294,11 @@ def append_dbcli_rules(include_copilot: bool = False):
         print_warning("DbCli rules block not found in INTEGRATION.md; skipping rules append")
         return
 
+    # Build both comment styles once; every target file gets one of these verbatim.
+    commented = "\n".join(f"# {line}" for line in rules.splitlines())
+    yaml_block = encode_rules_block(f"\n\n# DBCLI_RULES_START\n{commented}\n# DBCLI_RULES_END\n")
+    md_block = encode_rules_block(f"\n\n<!-- DBCLI_RULES_START -->\n{rules}\n<!-- DBCLI_RULES_END -->\n")
+
     rule_files = [
         Path("CLAUDE.md"),
         Path("Claude.md"),
@@ -138,20 +310,54 @@ def append_dbcli_rules(include_copilot: bool = False):
         Path(".gemini") / "skills.yml",
     ]
 
-    for file_path in rule_files:
-        append_dbcli_rules_to_file(file_path, rules)
+    with _RULES_LOCK:
+        for file_path in rule_files:
+            append_dbcli_rules_to_file(file_path, md_block, yaml_block)
+
+        if include_copilot:
+            append_dbcli_rules_to_file(Path(".github") / "copilot-instructions.md", md_block, yaml_block)
+
+@functools.lru_cache(maxsize=None)
+def list_skills_source(skills_source: Path) -> frozenset:
+    """Entry names in the skills source; one readdir shared by every deploy target."""
+    return frozenset(os.listdir(skills_source))
+
+def copy_skill_items(items, dest_dirs) -> list[str]:
+    """Copy SKILLS_SOURCE entries into every dest dir concurrently; returns the copied items in order.
 
-    if include_copilot:
-        append_dbcli_rules_to_file(Path(".github") / "copilot-instructions.md", rules)
+    Each source file is read once no matter how many destinations it goes to.
+    """
+    available = list_skills_source(SKILLS_SOURCE)
+
+    def copy_item(item):
+        if item not in available:
+            return None
+        source_path = SKILLS_SOURCE / item
+        if source_path.is_dir():
+            fast_mirror(source_path, [dest_dir / item for dest_dir in dest_dirs])
+        else:
+            copy_file_to_all(source_path, [dest_dir / item for dest_dir in dest_dirs])
+        return item
+
+    if not items or not dest_dirs:
+        return []
+    from concurrent.futures import ThreadPoolExecutor  # pulls in logging; only load when copying
+
+    # File copies release the GIL during file I/O, so independent items copy in parallel.
+    with ThreadPoolExecutor(max_workers=min(8, len(items))) as executor:
+        return [item for item in executor.map(copy_item, items) if item]
 
 def get_claude_skill_names(skills_source: Path) -> list[str]:
-    names: list[str] = []
-    for child in skills_source.iterdir():
-        if child.is_dir() and (child / "SKILL.md").exists():
-            names.append(child.name)
-    return sorted(names)
+    # DirEntry.is_dir() uses the d_type from readdir; only SKILL.md needs a stat.
+    with os.scandir(skills_source) as it:
+        return sorted(
+            e.name for e in it
+            if e.is_dir() and os.path.exists(os.path.join(e.path, "SKILL.md"))
+        )
+
+def package_claude_skill_zip(skill_name: str, skills_source: Path, out_dir: Path, compresslevel: int = 1) -> Path:
+    import zipfile
 
-def package_claude_skill_zip(skill_name: str, skills_source: Path, out_dir: Path) -> Path:
     src_dir = skills_source / skill_name
     if not src_dir.exists():
         raise FileNotFoundError(f"Skill not found: {src_dir}")
@@ -161,57 +367,67 @@ def package_claude_skill_zip(skill_name: str, skills_source: Path, out_dir: Path
     if zip_path.exists():
         zip_path.unlink()
 
-    temp_root = Path(tempfile.mkdtemp(prefix=f"claude-skill-{skill_name}-"))
+    has_skill_md = any(p.is_file() and p.name.lower() == "skill.md" for p in src_dir.iterdir())
+    if not has_skill_md:
+        print_warning(f"Skill.md not found in skill folder (expected by Claude upload): {src_dir}")
+
+    # Write ZIP straight from the source tree with case-correct Skill.md entry name
+    # (Windows FS is case-insensitive, so the rename happens on the archive name only).
+    raw = open(zip_path, "wb")
+    buf = io.BufferedWriter(raw, buffer_size=COPY_BUFSIZE)
     try:
-        staged_skill_dir = temp_root / skill_name
-        shutil.copytree(src_dir, staged_skill_dir)
-
-        has_skill_md = any(p.is_file() and p.name.lower() == "skill.md" for p in staged_skill_dir.iterdir())
-        if not has_skill_md:
-            print_warning(f"Skill.md not found in skill folder (expected by Claude upload): {staged_skill_dir}")
-
-        # Write ZIP with case-correct Skill.md entry name (Windows FS is case-insensitive).
-        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr(f"{skill_name}/", "")
-            for file_path in staged_skill_dir.rglob("*"):
-                if not file_path.is_file():
-                    continue
-                rel = file_path.relative_to(staged_skill_dir).as_posix()
-                if file_path.name.lower() == "skill.md":
-                    parts = rel.split("/")
-                    parts[-1] = "Skill.md"
-                    rel = "/".join(parts)
-                zf.write(file_path, arcname=f"{skill_name}/{rel}")
-
-        return zip_path
+        with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+            for root, _dirs, files, dirfd in walk_tree(src_dir):
+                rel_dir = os.path.relpath(root, src_dir)
+                prefix = f"{skill_name}/" if rel_dir == os.curdir else f"{skill_name}/{Path(rel_dir).as_posix()}/"
+                for name in files:
+                    path = entry_path(root, name, dirfd)
+                    st = os.stat(path, dir_fd=dirfd)
+                    if not stat.S_ISREG(st.st_mode):
+                        continue
+                    arc_name = "Skill.md" if name.lower() == "skill.md" else name
+                    zinfo = zipfile.ZipInfo(prefix + arc_name, time.localtime(st.st_mtime)[:6])
+                    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+                    # DEFLATE costs more than it saves on tiny files; store those as-is.
+                    zinfo.compress_type = zipfile.ZIP_STORED if st.st_size < 1024 else zipfile.ZIP_DEFLATED
+                    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0), dir_fd=dirfd)
+                    with os.fdopen(fd, "rb") as f:
+                        zf.writestr(zinfo, f.read(), compresslevel=compresslevel)
     finally:
-        shutil.rmtree(temp_root, ignore_errors=True)
+        buf.close()
+
+    return zip_path
+
+@functools.lru_cache(maxsize=1)
+def get_dist_dirs():
+    """dist-* deployment directories to probe, best match for this host first."""
+    import platform
 
-def find_executable():
-    """Find dbcli executable with priority: dist-* > current dir > build output"""
-    script_dir = Path(__file__).parent.absolute()
-    
-    # Priority 1: Check dist-* deployment directories
     system = platform.system()
     if system == "Windows":
         machine = platform.machine().lower()
         is_arm = ("arm" in machine) or ("aarch" in machine)
-        dist_dirs = ["dist-win-arm64"] if is_arm else ["dist-win-x64"]
-    elif system == "Darwin":
-        dist_dirs = [
+        return ["dist-win-arm64"] if is_arm else ["dist-win-x64"]
+    if system == "Darwin":
+        return [
             "dist-macos-x64", "dist-macos-arm64",
             "dist-linux-x64", "dist-linux-arm64",
             "dist-win-x64", "dist-win-arm64",
         ]
-    else:
-        # Linux/WSL and other Unix-like platforms
-        dist_dirs = [
-            "dist-linux-x64", "dist-linux-arm64",
-            "dist-macos-x64", "dist-macos-arm64",
-            "dist-win-x64", "dist-win-arm64",
-        ]
+    # Linux/WSL and other Unix-like platforms
+    return [
+        "dist-linux-x64", "dist-linux-arm64",
+        "dist-macos-x64", "dist-macos-arm64",
+        "dist-win-x64", "dist-win-arm64",
+    ]
+
+@functools.lru_cache(maxsize=None)
+def find_executable():
+    """Find dbcli executable with priority: dist-* > current dir > build output"""
+    script_dir = SCRIPT_DIR
     
-    for dist_dir in dist_dirs:
+    # Priority 1: Check dist-* deployment directories
+    for dist_dir in get_dist_dirs():
         dist_path = script_dir / dist_dir
         if dist_path.exists():
             for exe_name in ["dbcli.exe", "dbcli"]:
@@ -241,10 +457,11 @@ def find_executable():
     
     return None
 
+@buffered_output()
 def install_scripts(add_to_path=False, skip_path=False):
     """Install dbcli executable + deployment scripts + docs to tools directory"""
-    print(f"\n{Colors.CYAN}📦 Installing DbCli (Executable + Scripts){Colors.NC}")
-    print(f"{Colors.CYAN}{'-' * 30}{Colors.NC}\n")
+    emit(f"\n{Colors.CYAN}📦 Installing DbCli (Executable + Scripts){Colors.NC}")
+    emit(f"{Colors.CYAN}{'-' * 30}{Colors.NC}\n")
     
     exe_path = find_executable()
     if not exe_path:
@@ -253,7 +470,7 @@ def install_scripts(add_to_path=False, skip_path=False):
         sys.exit(1)
     
     # Copy to target installation directory
-    install_dir = Path.home() / "tools" / "dbcli"
+    install_dir = HOME_DIR / "tools" / "dbcli"
     print_info(f"Installing to: {install_dir}")
     
     install_dir.mkdir(parents=True, exist_ok=True)
@@ -262,50 +479,66 @@ def install_scripts(add_to_path=False, skip_path=False):
     source_dir = exe_path.parent
     print_info(f"Copying binaries from: {source_dir}")
     
-    for item in source_dir.iterdir():
-        if item.name != "skills":
-            dest_path = install_dir / item.name
-            if item.is_dir():
-                if dest_path.exists():
-                    shutil.rmtree(dest_path)
-                shutil.copytree(item, dest_path)
-            else:
-                shutil.copy2(item, dest_path)
+    with os.scandir(source_dir) as it:
+        for item in it:
+            if item.name != "skills":
+                dest_path = install_dir / item.name
+                if item.is_dir():
+                    if dest_path.exists():
+                        shutil.rmtree(dest_path)
+                    fast_mirror(item.path, [dest_path])
+                else:
+                    fastcopy(item.path, dest_path)
 
     # Copy deployment scripts from the script directory
-    script_dir = Path(__file__).parent.absolute()
+    script_dir = SCRIPT_DIR
     for script_name in ["deploy-skills.ps1", "deploy-skills.py"]:
         script_path = script_dir / script_name
         if script_path.exists():
-            shutil.copy2(script_path, install_dir / script_name)
-            print(f"  - {script_name}")
+            fastcopy(script_path, install_dir / script_name)
+            emit(f"  - {script_name}")
 
     # Copy docs into tools
     for doc_name in ["README.md", "LICENSE"]:
         doc_path = script_dir / doc_name
         if doc_path.exists():
-            shutil.copy2(doc_path, install_dir / doc_name)
-            print(f"  - {doc_name}")
+            fastcopy(doc_path, install_dir / doc_name)
+            emit(f"  - {doc_name}")
     
     print_success(f"Installed {exe_path.name} to {install_dir}")
     
     # Add to PATH (platform-specific)
-    if platform.system() == "Windows":
+    if sys.platform == "win32":
         add_to_path_windows(install_dir, add_to_path, skip_path)
     else:
         add_to_path_unix(install_dir, add_to_path, skip_path)
     
-    print()
+    emit()
+
+def broadcast_environment_change():
+    """Notify running apps (Explorer, new shells) that the user environment changed; best effort."""
+    try:
+        import ctypes
+        HWND_BROADCAST = 0xFFFF
+        WM_SETTINGCHANGE = 0x001A
+        SMTO_ABORTIFHUNG = 0x0002
+        ctypes.windll.user32.SendMessageTimeoutW(
+            HWND_BROADCAST, WM_SETTINGCHANGE, 0, "Environment", SMTO_ABORTIFHUNG, 100, None
+        )
+    except Exception:
+        pass
 
 def add_to_path_windows(install_dir, add_to_path, skip_path):
     """Add directory to Windows PATH"""
     try:
-        # Check if already in PATH
-        result = subprocess.run(
-            ['powershell', '-Command', '[Environment]::GetEnvironmentVariable("PATH", "User")'],
-            capture_output=True, text=True
-        )
-        current_path = result.stdout.strip()
+        import winreg
+
+        # Check if already in PATH (read HKCU\Environment directly; no PowerShell spawn)
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, "Environment") as key:
+            try:
+                current_path, value_type = winreg.QueryValueEx(key, "PATH")
+            except FileNotFoundError:
+                current_path, value_type = "", winreg.REG_EXPAND_SZ
         path_entry = str(install_dir)
         
         if path_entry in current_path.split(';'):
@@ -325,12 +558,11 @@ def add_to_path_windows(install_dir, add_to_path, skip_path):
         else:
             print_info("Adding to PATH (default)...")
 
-        # Add to user PATH using PowerShell
+        # Add to user PATH, keeping the existing value type (REG_EXPAND_SZ preserves %VAR% entries)
         new_path = f"{current_path};{path_entry}" if current_path else path_entry
-        subprocess.run([
-            'powershell', '-Command',
-            f'[Environment]::SetEnvironmentVariable("PATH", "{new_path}", "User")'
-        ], check=True)
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, "Environment", 0, winreg.KEY_SET_VALUE) as key:
+            winreg.SetValueEx(key, "PATH", 0, value_type, new_path)
+        broadcast_environment_change()
         print_success("Added to PATH")
         print_warning("Restart your terminal for changes to take effect")
     except Exception as e:
@@ -340,7 +572,7 @@ def add_to_path_windows(install_dir, add_to_path, skip_path):
 def add_to_path_unix(install_dir, add_to_path, skip_path):
     """Add directory to Unix PATH (Linux/macOS)"""
     install_dir = Path(install_dir)
-    home = Path.home()
+    home = HOME_DIR
     profile_file = home / ".profile"  # login shells (bash -l) read this on most distros
     zshrc_file = home / ".zshrc"
 
@@ -401,20 +633,19 @@ def add_to_path_unix(install_dir, add_to_path, skip_path):
         print_error(f"Failed to modify PATH: {e}")
         print_warning(f"Add manually to {profile_file}: {path_export}")
 
-def deploy_claude_skills(claude_dir, force=False, copy_exe=False):
+@buffered_output()
+def deploy_claude_skills(claude_dir, force=False, copy_exe=False, overwrite=False):
     """Deploy skills to Claude Code with nested structure"""
     print_info("Deploying to Claude Code...")
     
     claude_dbcli_dir = Path(claude_dir) / "skills" / "dbcli"
     claude_skills_dir = claude_dbcli_dir / "skills"
     
-    # Check if already exists
-    if claude_dbcli_dir.exists() and not force:
+    # Check if already exists (overwrite is decided up front in main; never prompt here)
+    if claude_dbcli_dir.exists() and not (force or overwrite):
         print_warning(f"Claude dbcli already exists at {claude_dbcli_dir}")
-        response = input("Overwrite? (y/N): ").strip().lower()
-        if response != 'y':
-            print_info("Skipping Claude deployment")
-            return
+        print_info("Skipping Claude deployment (use --force to overwrite)")
+        return
     
     # Create directories
     claude_dbcli_dir.mkdir(parents=True, exist_ok=True)
@@ -428,8 +659,8 @@ def deploy_claude_skills(claude_dir, force=False, copy_exe=False):
         exe_path = find_executable()
         if exe_path:
             dest_exe = claude_dbcli_dir / exe_path.name
-            shutil.copy2(exe_path, dest_exe)
-            print(f"  - {exe_path.name} (executable)")
+            fastcopy(exe_path, dest_exe)
+            emit(f"  - {exe_path.name} (executable)")
         else:
             print_warning("DbCli executable not found, skipping exe deployment")
     
@@ -449,17 +680,8 @@ def deploy_claude_skills(claude_dir, force=False, copy_exe=False):
         "dbcli-interactive"
     ]
     
-    for item in skill_items:
-        source_path = SKILLS_SOURCE / item
-        if source_path.exists():
-            dest_path = claude_skills_dir / item
-            if source_path.is_dir():
-                if dest_path.exists():
-                    shutil.rmtree(dest_path)
-                shutil.copytree(source_path, dest_path)
-            else:
-                shutil.copy2(source_path, dest_path)
-            print(f"  - skills/{item}")
+    for item in copy_skill_items(skill_items, [claude_skills_dir]):
+        emit(f"  - skills/{item}")
 
     print_success(f"Claude Code deployed to {claude_dbcli_dir}")
     print_info("Structure: dbcli/ (exe) + dbcli/skills/ (skills)")
@@ -467,6 +689,7 @@ def deploy_claude_skills(claude_dir, force=False, copy_exe=False):
     print_info("Skills will be available in Claude Code after restart")
     append_dbcli_rules()
 
+@buffered_output()
 def deploy_copilot_instructions(force=False):
     """Deploy GitHub Copilot instructions"""
     print_info("Deploying GitHub Copilot instructions...")
@@ -603,19 +826,20 @@ def deploy_copilot_instructions(force=False):
         if not integration_path.exists():
             print_error("INTEGRATION.md not found")
         else:
-            with open(integration_path, 'r', encoding='utf-8') as f:
-                integration_content = f.read()
+            integration_content = read_integration_text(SKILLS_SOURCE)
 
             # Extract Copilot section
-            pattern = r'```markdown\s*([\s\S]*?)\s*```'
-            copilot_section = re.search(r'## 2\. GitHub Copilot Integration[\s\S]*?(?=## 3\.)', integration_content)
+            fence = "```markdown"
+            section_start = integration_content.find("## 2. GitHub Copilot Integration")
+            section_end = integration_content.find("## 3.", section_start) if section_start != -1 else -1
 
-            if copilot_section:
-                copilot_text = copilot_section.group(0)
-                match = re.search(pattern, copilot_text)
+            if section_end != -1:
+                copilot_text = integration_content[section_start:section_end]
+                fence_start = copilot_text.find(fence)
+                fence_end = copilot_text.find("```", fence_start + len(fence)) if fence_start != -1 else -1
 
-                if match:
-                    instructions_content = match.group(1)
+                if fence_end != -1:
+                    instructions_content = copilot_text[fence_start + len(fence):fence_end].strip()
                     with open(instructions_file, 'w', encoding='utf-8') as f:
                         f.write(instructions_content)
                     print_success(f"GitHub Copilot instructions created at {instructions_file}")
@@ -630,6 +854,7 @@ def deploy_copilot_instructions(force=False):
     skills_root = detect_copilot_skill_root()
     patch_copilot_config(config_file, skills_root)
 
+@buffered_output()
 def deploy_workspace_skills(force=False):
     """Deploy skills to workspace directory"""
     print_info("Deploying to workspace skills directory...")
@@ -656,18 +881,12 @@ def deploy_workspace_skills(force=False):
         return
     
     # Copy all skills
-    for item in source_dir.iterdir():
-        dest_path = workspace_skills_dir / item.name
-        if item.is_dir():
-            if dest_path.exists():
-                rmtree_force(dest_path)
-            shutil.copytree(item, dest_path)
-        else:
-            shutil.copy2(item, dest_path)
+    copy_skill_items(sorted(list_skills_source(source_dir)), [workspace_skills_dir])
 
     print_success(f"Workspace skills deployed to {workspace_skills_dir}")
     print_info("Skills available for Cursor, Cline/Roo/Kilo, and other workspace-based assistants")
 
+@buffered_output()
 def deploy_codex_skills(force=False, copy_exe=True, global_only=False):
     """Deploy skills to OpenAI Codex with nested structure"""
     print_info("Deploying to OpenAI Codex...")
@@ -681,8 +900,7 @@ def deploy_codex_skills(force=False, copy_exe=True, global_only=False):
     ]
     
     # Deploy to USER scope: ~/.codex/skills/dbcli/skills/
-    user_codex_dbcli_dir = Path.home() / '.codex' / 'skills' / 'dbcli'
-    user_codex_skills_dir = user_codex_dbcli_dir / 'skills'
+    user_codex_dbcli_dir = HOME_DIR / '.codex' / 'skills' / 'dbcli'
     
     if user_codex_dbcli_dir.exists():
         if force:
@@ -691,71 +909,94 @@ def deploy_codex_skills(force=False, copy_exe=True, global_only=False):
         else:
             print_warning(f"Codex USER dbcli already exists at: {user_codex_dbcli_dir}")
             print_info("Use --force to overwrite")
-    
-    if not user_codex_dbcli_dir.exists() or force:
-        user_codex_dbcli_dir.mkdir(parents=True, exist_ok=True)
-        user_codex_skills_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Copy executable
-        exe_path = find_executable()
-        if copy_exe and exe_path:
-            shutil.copy2(exe_path, user_codex_dbcli_dir / exe_path.name)
-            print(f"  - {exe_path.name}")
-        
-        # Copy skills to nested directory
-        for item in skill_items:
-            source_path = SKILLS_SOURCE / item
-            if source_path.exists():
-                dest_path = user_codex_skills_dir / item
-                if source_path.is_dir():
-                    if dest_path.exists():
-                        rmtree_force(dest_path)
-                    shutil.copytree(source_path, dest_path)
-                else:
-                    shutil.copy2(source_path, dest_path)
-                print(f"  - skills/{item}")
-
-        print_success(f"Codex USER deployed to: {user_codex_dbcli_dir}")
-    
-    if global_only:
-        print_info("Codex global-only mode: skipping repo deployment")
-        return
+    deploy_user = not user_codex_dbcli_dir.exists() or force
 
     # Deploy to REPO scope: ./.codex/skills/dbcli (if in a git repo)
-    if Path(".git").exists():
-        repo_codex_dbcli_dir = Path(".codex") / "skills" / "dbcli"
-        repo_codex_skills_dir = repo_codex_dbcli_dir / "skills"
-        
+    repo_codex_dbcli_dir = Path(".codex") / "skills" / "dbcli"
+    deploy_repo = False
+    repo_skipped = False
+    if not global_only and Path(".git").exists():
         if repo_codex_dbcli_dir.exists():
             if force:
                 print_warning(f"Overwriting existing Codex REPO skills")
                 rmtree_force(repo_codex_dbcli_dir)
             else:
                 print_info(f"Codex REPO skills already exist at: {repo_codex_dbcli_dir} (skipping)")
-                return
-        
-        if not repo_codex_dbcli_dir.exists() or force:
-            repo_codex_dbcli_dir.mkdir(parents=True, exist_ok=True)
-            repo_codex_skills_dir.mkdir(parents=True, exist_ok=True)
-
-            # Copy executable
-            exe_path = find_executable()
-            if copy_exe and exe_path:
-                shutil.copy2(exe_path, repo_codex_dbcli_dir / exe_path.name)
-            
-            for item in skill_items:
-                source_path = SKILLS_SOURCE / item
-                if source_path.exists():
-                    dest_path = repo_codex_skills_dir / item
-                    if source_path.is_dir():
-                        shutil.copytree(source_path, dest_path, dirs_exist_ok=True)
-                    else:
-                        shutil.copy2(source_path, dest_path)
-
-            print_success(f"Codex REPO deployed to: {repo_codex_dbcli_dir}")
-            print_info("Consider committing .codex/ to repository for team sharing")
+                repo_skipped = True
+        deploy_repo = not repo_skipped
+
+    # Both scopes get identical content, so copy each source file once into all of them.
+    dbcli_dirs = []
+    if deploy_user:
+        dbcli_dirs.append(user_codex_dbcli_dir)
+    if deploy_repo:
+        dbcli_dirs.append(repo_codex_dbcli_dir)
+    for dbcli_dir in dbcli_dirs:
+        (dbcli_dir / 'skills').mkdir(parents=True, exist_ok=True)
+
+    # Copy executable
+    exe_path = find_executable() if copy_exe else None
+    if exe_path and dbcli_dirs:
+        copy_file_to_all(exe_path, [dbcli_dir / exe_path.name for dbcli_dir in dbcli_dirs])
+        if deploy_user:
+            emit(f"  - {exe_path.name}")
+
+    # Copy skills to nested directory
+    copied = copy_skill_items(skill_items, [dbcli_dir / 'skills' for dbcli_dir in dbcli_dirs])
+
+    if deploy_user:
+        for item in copied:
+            emit(f"  - skills/{item}")
+        print_success(f"Codex USER deployed to: {user_codex_dbcli_dir}")
+    
+    if global_only:
+        print_info("Codex global-only mode: skipping repo deployment")
+        return
+
+    if repo_skipped:
+        return
+
+    if deploy_repo:
+        print_success(f"Codex REPO deployed to: {repo_codex_dbcli_dir}")
+        print_info("Consider committing .codex/ to repository for team sharing")
 
     append_dbcli_rules()
+
+def run_captured(deploy, wait_for=None):
+    """Run a deploy step, collecting its console output in a BufferedLog instead of printing it."""
+    if wait_for is not None:
+        wait_for.result()
+    log = _output.log = BufferedLog()
+    try:
+        deploy()
+        return log, None
+    except Exception as e:
+        return log, e
+    finally:
+        _output.log = None
+
+def run_deployments_parallel(deployments):
+    """Run deploy steps concurrently and replay their output in the original order."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {}
+        for name, deploy in deployments:
+            # Copilot picks its skills path by inspecting skills/, so let it finish before skills/dbcli is written.
+            wait_for = futures.get('copilot') if name == 'workspace' else None
+            futures[name] = executor.submit(run_captured, deploy, wait_for)
+
+    # Every target has already run, so replay all output before surfacing the first failure.
+    first_error = None
+    for i, (name, _deploy) in enumerate(deployments):
+        log, error = futures[name].result()
+        log.flush()
+        if first_error is None:
+            first_error = error
+        if i < len(deployments) - 1:
+            print()
+    if first_error is not None:
+        raise first_error
 
 def verify_dbcli():
     """Verify DbCli is installed"""
@@ -808,6 +1049,12 @@ def main():
         action='store_true',
         help='Overwrite existing installations without prompting'
     )
+    parser.add_argument(
+        '--interactive-confirm',
+        choices=['yes', 'no'],
+        default=None,
+        help='Ask before overwriting an existing Claude deployment (default: yes when stdin is a terminal)'
+    )
     parser.add_argument(
         '--install-scripts',
         action='store_true',
@@ -839,6 +1086,11 @@ def main():
         default='.',
         help='Output directory for Claude upload ZIPs (default: .)'
     )
+    parser.add_argument(
+        '--package-max-compression',
+        action='store_true',
+        help='Use maximum DEFLATE compression for Claude upload ZIPs (default: fastest)'
+    )
     
     args = parser.parse_args()
 
@@ -847,10 +1099,8 @@ def main():
         sys.exit(1)
 
     if args.claude_dir is None:
-        script_dir = Path(__file__).resolve().parent
-        cwd = Path.cwd().resolve()
-        repo_root = resolve_repo_root([script_dir, cwd])
-        args.claude_dir = str((repo_root / '.claude') if repo_root else (Path.home() / '.claude'))
+        repo_root = resolve_repo_root([SCRIPT_DIR, CWD])
+        args.claude_dir = str((repo_root / '.claude') if repo_root else (HOME_DIR / '.claude'))
     
     if args.package_claude_all or args.package_claude_skill:
         print_header("Claude Skills Packaging")
@@ -859,8 +1109,10 @@ def main():
     
     # Step 0: Install executable + scripts if requested
     if args.install_scripts:
-        install_script = Path(__file__).resolve().parent / "install-dbcli.py"
+        install_script = SCRIPT_DIR / "install-dbcli.py"
         if install_script.exists():
+            import subprocess
+
             cmd = [sys.executable, str(install_script)]
             if args.add_to_path:
                 cmd.append("--add-to-path")
@@ -899,10 +1151,11 @@ def main():
         print_info(f"Skills source: {SKILLS_SOURCE}")
         print_info(f"Output dir: {out_dir}")
 
+        compresslevel = 9 if args.package_max_compression else 1
         ok = True
         for name in skill_names:
             try:
-                created = package_claude_skill_zip(name, SKILLS_SOURCE, out_dir)
+                created = package_claude_skill_zip(name, SKILLS_SOURCE, out_dir, compresslevel)
                 print_success(f"Created: {created}")
             except Exception as e:
                 ok = False
@@ -914,24 +1167,37 @@ def main():
         print_info('Upload these ZIPs in Claude: Settings > Capabilities > Skills > "Upload skill"')
         return
     
+    # Resolve the overwrite policy once, before any deploy step runs
+    interactive = (args.interactive_confirm == 'yes') if args.interactive_confirm else sys.stdin.isatty()
+    claude_overwrite = args.force
+    claude_dbcli_dir = Path(args.claude_dir) / 'skills' / 'dbcli'
+    if args.target in ['claude', 'all'] and not args.force and interactive and claude_dbcli_dir.exists():
+        try:
+            response = input(f"Claude dbcli already exists at {claude_dbcli_dir}. Overwrite? (y/N): ")
+        except EOFError:
+            response = ''
+        claude_overwrite = response.strip().lower() == 'y'
+
     # Execute deployments
+    deployments = []
     if args.target in ['claude', 'all']:
-        deploy_claude_skills(args.claude_dir, args.force, copy_exe=False)
-        if args.target == 'all':
-            print()
+        deployments.append(('claude', lambda: deploy_claude_skills(args.claude_dir, args.force, copy_exe=False, overwrite=claude_overwrite)))
     
     if args.target in ['copilot', 'all']:
-        deploy_copilot_instructions(args.force)
-        if args.target == 'all':
-            print()
+        deployments.append(('copilot', lambda: deploy_copilot_instructions(args.force)))
     
     if args.target in ['codex', 'all']:
-        deploy_codex_skills(args.force, copy_exe=False, global_only=args.codex_global_only)
-        if args.target == 'all':
-            print()
+        deployments.append(('codex', lambda: deploy_codex_skills(args.force, copy_exe=False, global_only=args.codex_global_only)))
     
     if args.target in ['workspace', 'all']:
-        deploy_workspace_skills(args.force)
+        deployments.append(('workspace', lambda: deploy_workspace_skills(args.force)))
+
+    if args.target == 'all':
+        # Targets write to separate directories and no step prompts, so they can run side by side.
+        run_deployments_parallel(deployments)
+    else:
+        for _name, deploy in deployments:
+            deploy()
     
     # Verify installation
     verify_dbcli()
@@ -939,38 +1205,42 @@ def main():
     # Final summary
     print_header("Deployment Complete!")
     
-    print(f"{Colors.CYAN}Deployed to: {args.target}{Colors.NC}\n")
+    CYAN, NC = Colors.CYAN, Colors.NC
+    claude_skills = f"{Path(args.claude_dir) / 'skills' / 'dbcli'}"
+    codex_skills = f"{HOME_DIR / '.codex' / 'skills' / 'dbcli'}"
+    
+    print(f"{CYAN}Deployed to: {args.target}{NC}\n")
     
     if args.target in ['claude', 'all']:
-        print(f"{Colors.CYAN}Claude Code:{Colors.NC}")
-        print(f"  Location: {Path(args.claude_dir) / 'skills' / 'dbcli'}")
-        print(f"  Skills: {Path(args.claude_dir) / 'skills' / 'dbcli' / 'skills'}")
-        print(f"  Usage: Restart Claude Code, then skills auto-available\n")
+        print(f"{CYAN}Claude Code:{NC}")
+        print(f"  Location: {claude_skills}")
+        print(f"  Skills: {claude_skills}{os.sep}skills")
+        print("  Usage: Restart Claude Code, then skills auto-available\n")
     
     if args.target in ['copilot', 'all']:
-        print(f"{Colors.CYAN}GitHub Copilot:{Colors.NC}")
-        print(f"  Location: .github/copilot-instructions.md")
-        print(f"  Usage: Copilot reads automatically from workspace\n")
+        print(f"{CYAN}GitHub Copilot:{NC}")
+        print("  Location: .github/copilot-instructions.md")
+        print("  Usage: Copilot reads automatically from workspace\n")
     
     if args.target in ['codex', 'all']:
-        print(f"{Colors.CYAN}OpenAI Codex:{Colors.NC}")
-        print(f"  USER: {Path.home() / '.codex' / 'skills' / 'dbcli'}")
-        print(f"  USER Skills: {Path.home() / '.codex' / 'skills' / 'dbcli' / 'skills'}")
+        print(f"{CYAN}OpenAI Codex:{NC}")
+        print(f"  USER: {codex_skills}")
+        print(f"  USER Skills: {codex_skills}{os.sep}skills")
         if not args.codex_global_only:
-            print(f"  REPO: .codex/skills/dbcli (if in git repo)")
-            print(f"  REPO Skills: .codex/skills/dbcli/skills (if in git repo)")
-        print(f"  Usage: Restart Codex, skills auto-available\n")
+            print("  REPO: .codex/skills/dbcli (if in git repo)")
+            print("  REPO Skills: .codex/skills/dbcli/skills (if in git repo)")
+        print("  Usage: Restart Codex, skills auto-available\n")
     
     if args.target in ['workspace', 'all']:
-        print(f"{Colors.CYAN}Workspace Skills:{Colors.NC}")
-        print(f"  Location: skills/dbcli/")
-        print(f"  Usage: Available to Cursor, Cline/Roo/Kilo, etc.\n")
-    
-    print(f"{Colors.CYAN}Next steps:{Colors.NC}")
-    print(f"{Colors.NC}1. Restart your AI assistant (if needed){Colors.NC}")
-    print(f"{Colors.NC}2. Test a skill:{Colors.NC}")
-    print(f"   Ask: 'Query my SQLite database for all users'")
-    print(f"{Colors.NC}3. See skills/INTEGRATION.md for platform-specific usage{Colors.NC}")
+        print(f"{CYAN}Workspace Skills:{NC}")
+        print("  Location: skills/dbcli/")
+        print("  Usage: Available to Cursor, Cline/Roo/Kilo, etc.\n")
+    
+    print(f"{CYAN}Next steps:{NC}")
+    print(f"{NC}1. Restart your AI assistant (if needed){NC}")
+    print(f"{NC}2. Test a skill:{NC}")
+    print("   Ask: 'Query my SQLite database for all users'")
+    print(f"{NC}3. See skills/INTEGRATION.md for platform-specific usage{NC}")
     print()
 
 if __name__ == '__main__':
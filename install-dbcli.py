@@ -6,13 +6,14 @@ Install DbCli executable + deployment scripts into ~/tools/dbcli.
 """
 
 import argparse
+import functools
 import os
-import platform
 import shutil
-import subprocess
 import sys
 from pathlib import Path
 
+_HOME = Path.home()
+
 
 class Colors:
     GREEN = '\033[0;32m'
@@ -44,43 +45,69 @@ def print_header(title):
     print(f"{Colors.CYAN}{'=' * 40}{Colors.NC}\n")
 
 
+@functools.lru_cache(maxsize=1)
+def _host() -> tuple[str, str]:
+    # (system, lowercased machine); platform is only imported once this is first needed.
+    import platform
+    return platform.system(), platform.machine().lower()
+
+
+@functools.lru_cache(maxsize=1)
 def get_dist_dirs():
-    system = platform.system()
+    system, machine = _host()
+    is_arm = ("arm" in machine) or ("aarch" in machine)
+    arch = "arm64" if is_arm else "x64"
     if system == "Windows":
-        machine = platform.machine().lower()
-        is_arm = ("arm" in machine) or ("aarch" in machine)
-        return ["dist-win-arm64"] if is_arm else ["dist-win-x64"]
+        return [f"dist-win-{arch}"]
     if system == "Darwin":
-        return [
+        candidates = [
             "dist-macos-x64", "dist-macos-arm64",
             "dist-linux-x64", "dist-linux-arm64",
             "dist-win-x64", "dist-win-arm64",
         ]
-    return [
-        "dist-linux-x64", "dist-linux-arm64",
-        "dist-macos-x64", "dist-macos-arm64",
-        "dist-win-x64", "dist-win-arm64",
-    ]
+        primary = f"dist-macos-{arch}"
+    else:
+        candidates = [
+            "dist-linux-x64", "dist-linux-arm64",
+            "dist-macos-x64", "dist-macos-arm64",
+            "dist-win-x64", "dist-win-arm64",
+        ]
+        primary = f"dist-linux-{arch}"
+    # The build for this host's OS and architecture comes first; the rest stay as fallbacks.
+    return [primary] + [d for d in candidates if d != primary]
+
+
+def _scan_names(path) -> dict:
+    try:
+        with os.scandir(path) as it:
+            return {e.name: e for e in it}
+    except OSError:
+        return {}
 
 
 def find_executable(script_dir: Path):
+    # One readdir of script_dir instead of stat-probing every candidate path.
+    entries = _scan_names(script_dir)
+
     # Priority 1: dist-* directories
     for dist_dir in get_dist_dirs():
-        dist_path = script_dir / dist_dir
-        if not dist_path.exists():
+        entry = entries.get(dist_dir)
+        if entry is None or not entry.is_dir():
             continue
+        dist_entries = _scan_names(entry.path)
         for exe_name in ["dbcli.exe", "dbcli"]:
-            exe_path = dist_path / exe_name
-            if exe_path.exists():
+            # is_file() reuses the d_type from the scan; no extra stat.
+            exe_entry = dist_entries.get(exe_name)
+            if exe_entry is not None and exe_entry.is_file():
                 print_info(f"Found deployment: {dist_dir}/{exe_name}")
-                return exe_path
+                return script_dir / dist_dir / exe_name
 
     # Priority 2: current directory
     for exe_name in ["dbcli.exe", "dbcli"]:
-        exe_path = script_dir / exe_name
-        if exe_path.exists():
+        exe_entry = entries.get(exe_name)
+        if exe_entry is not None and exe_entry.is_file():
             print_info(f"Found: {exe_name}")
-            return exe_path
+            return script_dir / exe_name
 
     # Priority 3: build output directories
     for build_path in [
@@ -102,33 +129,61 @@ def find_executable(script_dir: Path):
     return None
 
 
-def resolve_skills_source(script_dir: Path) -> Path:
-    script_skills = script_dir / "skills"
-    if (script_skills / "INTEGRATION.md").exists() and (script_skills / "dbcli-query" / "SKILL.md").exists():
-        return script_skills
-
-    tools_skills = Path.home() / "tools" / "dbcli" / "skills"
-    if (tools_skills / "INTEGRATION.md").exists() and (tools_skills / "dbcli-query" / "SKILL.md").exists():
-        return tools_skills
+def _has_skills(root: Path) -> bool:
+    try:
+        os.stat(root / "INTEGRATION.md")
+        os.stat(root / "dbcli-query" / "SKILL.md")
+        return True
+    except OSError:
+        return False
 
-    return Path()
 
+def resolve_skills_source(script_dir: Path) -> Path:
+    for root in (script_dir / "skills", _HOME / "tools" / "dbcli" / "skills"):
+        if _has_skills(root):
+            return root
 
-def _ps_escape(value: str) -> str:
-    # Escape single quotes for PowerShell single-quoted strings.
-    return value.replace("'", "''")
+    return Path()
 
 
 def _normalize_parts(parts: list[str]) -> list[str]:
-    seen = set()
-    result = []
+    # Case-insensitive dedupe; dict insertion order keeps the first spelling of each entry.
+    seen = {}
     for part in parts:
-        key = part.lower()
-        if key in seen:
-            continue
-        seen.add(key)
-        result.append(part)
-    return result
+        seen.setdefault(part.lower(), part)
+    return list(seen.values())
+
+
+def _broadcast_environment_change():
+    # Let Explorer/new shells refresh; SMTO_ABORTIFHUNG + 100 ms so a slow window never stalls us.
+    try:
+        import ctypes
+        HWND_BROADCAST = 0xFFFF
+        WM_SETTINGCHANGE = 0x001A
+        SMTO_ABORTIFHUNG = 0x0002
+        ctypes.windll.user32.SendMessageTimeoutW(
+            HWND_BROADCAST, WM_SETTINGCHANGE, 0, "Environment", SMTO_ABORTIFHUNG, 100, None
+        )
+    except Exception:
+        pass
+
+
+def _read_user_path() -> str:
+    import winreg
+    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, "Environment") as key:
+        try:
+            return winreg.QueryValueEx(key, "Path")[0]
+        except FileNotFoundError:
+            return ""
+
+
+def _set_user_path(value: str):
+    # Write HKCU\Environment directly: [Environment]::SetEnvironmentVariable broadcasts
+    # WM_SETTINGCHANGE synchronously and can stall for seconds behind unresponsive windows.
+    import winreg
+    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, "Environment", 0, winreg.KEY_SET_VALUE) as key:
+        winreg.SetValueEx(key, "Path", 0, winreg.REG_EXPAND_SZ, value)
+    _broadcast_environment_change()
 
 
 def add_to_path_windows(
@@ -136,13 +191,16 @@ def add_to_path_windows(
     add_to_path: bool,
     fix_user_path: bool,
 ):
+    path_entry = str(install_dir)
+    # Re-install fast path: already on this session's PATH and nothing to normalize.
+    if not fix_user_path:
+        entry_key = path_entry.lower()
+        if any(p.strip().lower() == entry_key for p in os.environ.get("PATH", "").split(os.pathsep)):
+            print_success("Already in PATH")
+            return
+
     try:
-        result = subprocess.run(
-            ['powershell', '-Command', '[Environment]::GetEnvironmentVariable("PATH", "User")'],
-            capture_output=True, text=True
-        )
-        current_path = result.stdout.strip()
-        path_entry = str(install_dir)
+        current_path = _read_user_path().strip()
 
         parts = [p.strip() for p in current_path.split(';') if p.strip()] if current_path else []
         parts = _normalize_parts(parts)
@@ -152,10 +210,7 @@ def add_to_path_windows(
             if fixed:
                 fixed = f"{fixed};"
             if fixed != current_path:
-                subprocess.run([
-                    'powershell', '-Command',
-                    f"[Environment]::SetEnvironmentVariable('PATH', '{_ps_escape(fixed)}', 'User')"
-                ], check=True)
+                _set_user_path(fixed)
                 current_path = fixed
                 print_success("Normalized user PATH")
 
@@ -176,10 +231,7 @@ def add_to_path_windows(
         new_path = ";".join(new_parts)
         if fix_user_path and new_path:
             new_path = f"{new_path};"
-        subprocess.run([
-            'powershell', '-Command',
-            f"[Environment]::SetEnvironmentVariable('PATH', '{_ps_escape(new_path)}', 'User')"
-        ], check=True)
+        _set_user_path(new_path)
         print_success("Added to PATH")
         print_warning("Restart your terminal for changes to take effect")
     except Exception as e:
@@ -188,22 +240,28 @@ def add_to_path_windows(
 
 
 def add_to_path_unix(install_dir: Path, add_to_path: bool):
-    home = Path.home()
+    import mmap
+
+    home = _HOME
     profile_file = home / ".profile"
     zshrc_file = home / ".zshrc"
     path_export = f'export PATH="{install_dir}:$PATH"'
+    needle = str(install_dir).encode("utf-8")
+    block = f"\n# DbCli\n{path_export}\n"
 
     def ensure_export_in_file(rc_path: Path) -> bool:
         rc_path.parent.mkdir(parents=True, exist_ok=True)
-        if rc_path.exists():
-            try:
-                content = rc_path.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                content = rc_path.read_text(errors="ignore")
-            if str(install_dir) in content:
-                return False
+        try:
+            size = os.stat(rc_path).st_size
+        except FileNotFoundError:
+            size = 0
+        if size:
+            # Search the mapped bytes directly instead of decoding the file into a str.
+            with open(rc_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(needle) != -1:
+                    return False
         with open(rc_path, 'a', encoding="utf-8") as f:
-            f.write(f"\n# DbCli\n{path_export}\n")
+            f.write(block)
         return True
 
     current_path = os.environ.get("PATH", "")
@@ -227,7 +285,56 @@ def add_to_path_unix(install_dir: Path, add_to_path: bool):
     print_warning(f"Run: source {profile_file} (or restart your terminal)")
 
 
-def install_dbcli(add_to_path: bool, force: bool, fix_user_path: bool):
+def _link_or_copy(src: Path, dst: Path, hardlink: bool):
+    # Unlink first: dst may already be a hardlink to src, which copy2 would reject as the same file.
+    dst.unlink(missing_ok=True)
+    if hardlink:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass  # cross-device, unsupported filesystem, ...
+    shutil.copy2(src, dst)
+
+
+def _stage_and_swap(source_dir: Path, install_dir: Path):
+    # Copy into a sibling staging dir, then move each entry into place with os.replace,
+    # so a failed copy never leaves a half-written binary in install_dir.
+    staging = install_dir.with_suffix(".new")
+    shutil.rmtree(staging, ignore_errors=True)
+    top = os.fspath(source_dir)
+    try:
+        shutil.copytree(source_dir, staging, ignore=lambda d, names: {"skills"} if d == top else ())
+        # DirEntry types come from the readdir itself, so no per-entry stat on either side.
+        existing = _scan_names(install_dir)
+        with os.scandir(staging) as it:
+            items = list(it)
+        for item in items:
+            dest = install_dir / item.name
+            dest_entry = existing.get(item.name)
+            old = None
+            if dest_entry is not None and dest_entry.is_dir(follow_symlinks=False):
+                # os.replace cannot overwrite a non-empty directory; move it aside first.
+                old = install_dir / f".{item.name}.old"
+                shutil.rmtree(old, ignore_errors=True)
+                os.replace(dest, old)
+            elif dest_entry is not None and item.is_dir(follow_symlinks=False):
+                dest.unlink()
+            try:
+                os.replace(item.path, dest)
+            except OSError:
+                # e.g. a locked file on Windows: put the previous version back rather than
+                # leaving the entry missing and the old copy stranded under the dot-name.
+                if old:
+                    os.replace(old, dest)
+                raise
+            if old:
+                shutil.rmtree(old)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def install_dbcli(add_to_path: bool, force: bool, fix_user_path: bool, hardlink: bool = False):
     print_header("DbCli Install")
     script_dir = Path(__file__).resolve().parent
     exe_path = find_executable(script_dir)
@@ -236,7 +343,7 @@ def install_dbcli(add_to_path: bool, force: bool, fix_user_path: bool):
         print_warning("Build the project first: dotnet build -c Release")
         sys.exit(1)
 
-    install_dir = Path.home() / "tools" / "dbcli"
+    install_dir = _HOME / "tools" / "dbcli"
     print_info(f"Installing to: {install_dir}")
     install_dir.mkdir(parents=True, exist_ok=True)
 
@@ -248,28 +355,16 @@ def install_dbcli(add_to_path: bool, force: bool, fix_user_path: bool):
         print_warning("Source and install directory are the same; skipping binary copy")
     else:
         print_info(f"Copying binaries from: {source_dir}")
-        for item in source_dir.iterdir():
-            if item.name == "skills":
-                continue
-            dest_path = install_dir / item.name
-            if dest_path.exists():
-                if dest_path.is_dir():
-                    shutil.rmtree(dest_path)
-                else:
-                    dest_path.unlink()
-            if item.is_dir():
-                shutil.copytree(item, dest_path)
-            else:
-                shutil.copy2(item, dest_path)
-
-    for script_name in ["deploy-skills.ps1", "deploy-skills.py", "install-dbcli.ps1", "install-dbcli.py"]:
-        script_path = script_dir / script_name
-        if script_path.exists():
-            dest = install_dir / script_name
-            if script_path.resolve() == dest.resolve():
-                continue
-            shutil.copy2(script_path, dest)
-            print(f"  ✓ {script_name}")
+        _stage_and_swap(source_dir, install_dir)
+
+    # script_dir is already resolved; compare once instead of resolving every file pair.
+    same_dir = script_dir == install_resolved
+    if not same_dir:
+        for script_name in ["deploy-skills.ps1", "deploy-skills.py", "install-dbcli.ps1", "install-dbcli.py"]:
+            script_path = script_dir / script_name
+            if script_path.exists():
+                _link_or_copy(script_path, install_dir / script_name, hardlink)
+                print(f"  ✓ {script_name}")
 
     skills_source = resolve_skills_source(script_dir)
     if skills_source and (skills_source / "INTEGRATION.md").exists():
@@ -282,17 +377,16 @@ def install_dbcli(add_to_path: bool, force: bool, fix_user_path: bool):
         else:
             print_warning("Skills already in tools directory; skipping skills copy")
 
-    for doc_name in ["README.md", "LICENSE"]:
-        doc_path = script_dir / doc_name
-        if doc_path.exists():
-            dest = install_dir / doc_name
-            if doc_path.resolve() != dest.resolve():
-                shutil.copy2(doc_path, dest)
+    if not same_dir:
+        for doc_name in ["README.md", "LICENSE"]:
+            doc_path = script_dir / doc_name
+            if doc_path.exists():
+                _link_or_copy(doc_path, install_dir / doc_name, hardlink)
                 print(f"  ✓ {doc_name}")
 
     print_success(f"Installed {exe_path.name} to {install_dir}")
 
-    if platform.system() == "Windows":
+    if _host()[0] == "Windows":
         add_to_path_windows(install_dir, add_to_path, fix_user_path)
     else:
         add_to_path_unix(install_dir, add_to_path)
@@ -305,9 +399,13 @@ def main():
     parser.add_argument("--add-to-path", action="store_true", help="Force add to PATH")
     parser.add_argument("--fix-user-path", action="store_true", help="Normalize user PATH and ensure trailing ';' (Windows only)")
     parser.add_argument("--force", action="store_true", help="Overwrite existing files (default behavior)")
+    parser.add_argument(
+        "--hardlink", action="store_true",
+        help="Hardlink scripts and docs from the source tree instead of copying (edits to the source then affect the install)"
+    )
     args = parser.parse_args()
 
-    install_dbcli(args.add_to_path, args.force, args.fix_user_path)
+    install_dbcli(args.add_to_path, args.force, args.fix_user_path, args.hardlink)
 
 
 if __name__ == "__main__":